@@ -3,28 +3,53 @@
 # Made safer: no unsafe undocumented tweaks, reversible, with proper error handling
 # GUI styled similarly to original FastPing Lite Shoutout to them for the inspiration!
 
-import ctypes, sys, os, subprocess, json, webbrowser, shutil, traceback
+import ctypes, sys, os, subprocess, json, webbrowser, shutil, traceback, tempfile, threading
 from pathlib import Path
-from PIL import Image, ImageTk
-import customtkinter as ctk
-from tkinter import messagebox
 import re
+import queue
+import atexit
+import logging
+import logging.handlers
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields, asdict
+
+# orjson is optional; fall back to the stdlib encoder when it isn't installed
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, indent=2).encode("utf-8")
+
+    _loads = json.loads
 
 # ------------------------------------------------------------
 # Helpers & Environment
 # ------------------------------------------------------------
+IS_WINDOWS = sys.platform.startswith("win")
+
 def is_windows():
-    return sys.platform.startswith("win")
+    return IS_WINDOWS
+
+def _check_admin():
+    try:
+        return IS_WINDOWS and hasattr(ctypes, "windll") and bool(ctypes.windll.shell32.IsUserAnAdmin())
+    except Exception:
+        return False
+
+# Elevation can't change during the process lifetime, so query it once
+IS_ADMIN = _check_admin()
 
 # Only attempt elevation on Windows
 def run_as_admin():
-    if not is_windows():
+    if not IS_WINDOWS:
         return False
-    try:
-        if hasattr(ctypes, "windll") and ctypes.windll.shell32.IsUserAnAdmin():
-            return True
-    except Exception:
-        pass
+    if IS_ADMIN:
+        return True
     try:
         python_exe = sys.executable
         script = os.path.abspath(sys.argv[0])
@@ -38,6 +63,11 @@ def run_as_admin():
 # Try to elevate (harmless on non-Windows)
 run_as_admin()
 
+# GUI toolkits are imported only after elevation so the short-lived
+# non-elevated launcher process never pays for loading them.
+import customtkinter as ctk
+from tkinter import messagebox
+
 def resource_path(relative_path):
     try:
         base_path = sys._MEIPASS  # type: ignore
@@ -49,128 +79,212 @@ def resource_path(relative_path):
 # Paths & Logging
 # ------------------------------------------------------------
 CONFIG_DIR = Path(os.getenv("APPDATA", "")) / "DelayKillerLite" / "config"
-CONFIG_DIR.mkdir(parents=True, exist_ok=True)
 CONFIG_FILE = CONFIG_DIR / "settings.json"
 LOG_FILE = CONFIG_DIR / "app.log"
 BACKUP_FILE = CONFIG_DIR / "backup.json"
 
+def _atomic_write_bytes(path, data):
+    """Write to a sibling .tmp file and rename it over path, so readers never see a half-written file."""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+# CONFIG_DIR is created lazily: writers try first and only mkdir when the directory is missing
+def write_config_file(path, data):
+    try:
+        _atomic_write_bytes(path, data)
+    except FileNotFoundError:
+        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        _atomic_write_bytes(path, data)
+
+class _ConfigDirFileHandler(logging.FileHandler):
+    def _open(self):
+        try:
+            return super()._open()
+        except FileNotFoundError:
+            CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+            return super()._open()
+
+# log() only enqueues; a listener thread owns the open log file and does the writes
+_log_queue = queue.SimpleQueue()
+_log_handler = _ConfigDirFileHandler(LOG_FILE, encoding="utf-8", delay=True)
+_log_handler.setFormatter(logging.Formatter("%(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 def log(msg):
     try:
-        with open(LOG_FILE, "a", encoding="utf-8") as f:
-            f.write(msg.rstrip() + "\n")
+        _log_queue.put_nowait(logging.LogRecord("delaykiller", logging.INFO, "", 0, msg.rstrip(), None, None))
     except Exception:
         pass
 
+# Parsed JSON files keyed by path, invalidated when the file's mtime changes
+_json_cache = {}
+
+def load_json_cached(path):
+    """Return the parsed JSON content of path, re-reading only if the file changed since the last call."""
+    mtime = path.stat().st_mtime_ns
+    cached = _json_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    data = _loads(path.read_bytes())
+    _json_cache[path] = (mtime, data)
+    return data
+
 # ------------------------------------------------------------
 # Backup / Restore (safe, best-effort)
 # ------------------------------------------------------------
+# slots=True needs Python 3.10+; older interpreters get a regular dataclass
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_SLOTS)
+class TcpGlobals:
+    """Snapshot of the netsh TCP global settings we change; None means unknown."""
+    autotuninglevel: "str | None" = None
+    ecncapability: "str | None" = None
+    rss: "str | None" = None
+    chimney: "str | None" = None
+    congestionprovider: "str | None" = None
+    timestamps: "str | None" = None
+
+    @classmethod
+    def from_dict(cls, d):
+        """Build from the dict stored in backup.json (missing/unknown keys are ignored)."""
+        d = d or {}
+        return cls(**{k: d.get(k) for k in _TCP_GLOBAL_KEYS})
+
+_TCP_GLOBAL_KEYS = tuple(f.name for f in fields(TcpGlobals))
+
+# Precompiled once at import; the TCP globals labels are combined into a single
+# alternation so the netsh output is scanned in one pass.
+_TCP_GLOBALS_RE = re.compile(
+    r"(?:(?P<autotuninglevel>Receive Window Auto-Tuning Level)"
+    r"|(?P<ecncapability>ECN Capability)"
+    r"|(?P<rss>Receive-Side Scaling State|\brss\b)"
+    r"|(?P<chimney>Chimney Offload State|\bchimney\b)"
+    r"|(?P<congestionprovider>Add-On Congestion Control Provider)"
+    r"|(?P<timestamps>RFC 1323 Timestamps|\btimestamps\b))"
+    r"\s*:\s*(?P<value>.+)",
+    re.IGNORECASE,
+)
+_IPV4_RE = re.compile(r'\b\d{1,3}(?:\.\d{1,3}){3}\b')
+_DHCP_RE = re.compile(r'\bdhcp\b', re.IGNORECASE)
+_POWER_GUID_RE = re.compile(r'([0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})')
+
 def get_tcp_globals():
-    """Query netsh for relevant TCP global settings and return a dict (best-effort)."""
-    if not is_windows():
-        return {}
-    code, out = run_netsh("netsh interface tcp show global")
+    """Query netsh for relevant TCP global settings and return a TcpGlobals (best-effort)."""
+    vals = TcpGlobals()
+    code, out = run_netsh(["interface", "tcp", "show", "global"])
     if code != 0 or not out:
-        return {}
-    vals = {}
-    # Normalize output lines and search for expected keys
-    lines = out.splitlines()
-    text = "\n".join(lines)
-    # Map friendly keys -> regex to find values
-    patterns = {
-        "autotuninglevel": r"(Receive Window Auto-Tuning Level\s*:\s*)(.+)",
-        "ecncapability": r"(ECN Capability\s*:\s*)(.+)",
-        "rss": r"(Receive-Side Scaling State\s*:\s*)(.+)|(\brss\b\s*:\s*(.+))",
-        "chimney": r"(Chimney Offload State\s*:\s*)(.+)|(\bchimney\b\s*:\s*(.+))",
-        "congestionprovider": r"(Add-On Congestion Control Provider\s*:\s*)(.+)",
-        "timestamps": r"(RFC 1323 Timestamps\s*:\s*)(.+)|(\btimestamps\b\s*:\s*(.+))",
-    }
-    for k, pat in patterns.items():
-        m = re.search(pat, text, re.IGNORECASE)
-        if m:
-            # take the last captured non-empty group
-            for g in m.groups()[1:]:
-                if g and isinstance(g, str) and g.strip():
-                    vals[k] = g.strip()
-                    break
-        else:
-            vals[k] = None
+        return vals
+    # `.+` stops at line ends (a trailing \r is stripped below), so scan the raw output directly
+    for m in _TCP_GLOBALS_RE.finditer(out):
+        value = m.group("value").strip()
+        if not value:
+            continue
+        for k in _TCP_GLOBAL_KEYS:
+            if m.group(k):
+                # keep the first occurrence of each key
+                if getattr(vals, k) is None:
+                    setattr(vals, k, value)
+                break
     return vals
 
 def get_dns_info(iface):
     """Return dict {dhcp: bool, servers: [ips]} for interface (best-effort)."""
-    if not is_windows():
-        return {"dhcp": False, "servers": []}
-    code, out = run_netsh(f'netsh interface ipv4 show dns name="{iface}"')
+    # Read straight from the adapter table when possible (no netsh spawn)
+    for name, guid, servers in get_adapters() or ():
+        if name == iface:
+            return {"dhcp": not _has_static_dns(guid), "servers": servers}
+    code, out = run_netsh(["interface", "ipv4", "show", "dns", f"name={iface}"])
     if code != 0 or not out:
         return {"dhcp": False, "servers": []}
     # Find all IPv4 addresses
-    servers = re.findall(r'\b\d{1,3}(?:\.\d{1,3}){3}\b', out)
-    dhcp = bool(re.search(r'\b(DHCP|dhcp)\b', out))
+    servers = _IPV4_RE.findall(out)
+    dhcp = bool(_DHCP_RE.search(out))
     return {"dhcp": dhcp, "servers": servers}
 
 def get_active_power_guid():
-    code, out = run_cmd("powercfg /getactivescheme", timeout=4)
+    code, out = run_cmd(["powercfg", "/getactivescheme"], timeout=4)
     if code != 0 or not out:
         return None
-    m = re.search(r'([0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})', out)
+    m = _POWER_GUID_RE.search(out)
     return m.group(1) if m else None
 
+# Last backup taken in this session, kept so restores don't have to re-read BACKUP_FILE
+_current_backup = None
+
+def load_backup():
+    """Return the most recent backup dict, or None when there is no backup."""
+    if _current_backup is not None:
+        return _current_backup
+    try:
+        return load_json_cached(BACKUP_FILE)
+    except FileNotFoundError:
+        return None
+
 def backup_settings(iface=None):
     """Save current relevant settings to BACKUP_FILE (best-effort)."""
+    global _current_backup
     try:
-        tcp = get_tcp_globals()
-        iface = iface or (iface_var.get() if 'iface_var' in globals() else "Ethernet")
-        dns = {iface: get_dns_info(iface)}
-        power = get_active_power_guid()
-        data = {"tcp_globals": tcp, "dns": dns, "power": power, "timestamp": int(Path(LOG_FILE).stat().st_mtime) if LOG_FILE.exists() else None}
-        with open(BACKUP_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        iface = iface or (selected_iface() if 'iface_var' in globals() else "Ethernet")
+        # The three probes query independent subsystems, so run them concurrently
+        with ThreadPoolExecutor(max_workers=3) as ex:
+            f_tcp = ex.submit(get_tcp_globals)
+            f_dns = ex.submit(get_dns_info, iface)
+            f_power = ex.submit(get_active_power_guid)
+            tcp, dns, power = asdict(f_tcp.result()), {iface: f_dns.result()}, f_power.result()
+        try:
+            timestamp = int(LOG_FILE.stat().st_mtime)
+        except OSError:
+            timestamp = None
+        data = {"tcp_globals": tcp, "dns": dns, "power": power, "timestamp": timestamp}
+        write_config_file(BACKUP_FILE, _dumps(data))
+        _current_backup = data
         log("Backup saved: " + json.dumps({"tcp": tcp, "dns": dns, "power": power}))
         return True
     except Exception as e:
         log("Backup failed: " + str(e))
         return False
 
+# netsh script lines used to write each TcpGlobals field back
+_TCP_SET_TEMPLATES = tuple((key, f"interface tcp set global {key}={{}}") for key in _TCP_GLOBAL_KEYS)
+
 def restore_from_backup():
     """Restore settings from BACKUP_FILE (best-effort)."""
-    if not BACKUP_FILE.exists():
-        log("No backup file to restore from")
-        return False
     try:
-        with open(BACKUP_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        tcp = data.get("tcp_globals", {})
+        data = load_backup()
+        if data is None:
+            log("No backup file to restore from")
+            return False
+        tcp = TcpGlobals.from_dict(data.get("tcp_globals"))
         # Restore TCP globals (call set for known keys)
-        mapping = {
-            "autotuninglevel": lambda v: f'netsh interface tcp set global autotuninglevel={v}',
-            "ecncapability": lambda v: f'netsh interface tcp set global ecncapability={v}',
-            "rss": lambda v: f'netsh interface tcp set global rss={v}',
-            "chimney": lambda v: f'netsh interface tcp set global chimney={v}',
-            "congestionprovider": lambda v: f'netsh interface tcp set global congestionprovider={v}',
-            "timestamps": lambda v: f'netsh interface tcp set global timestamps={v if v else "enabled"}',
-        }
-        for k, v in tcp.items():
+        cmds = []
+        for key, tmpl in _TCP_SET_TEMPLATES:
+            v = getattr(tcp, key)
             if v:
-                cmd = mapping.get(k)
-                if cmd:
-                    run_netsh(cmd(v))
+                cmds.append(tmpl.format(v))
+        code, out = run_netsh_batch(cmds)
+        if code != 0:
+            log("Some TCP settings were not restored: " + out)
         # Restore DNS
         dns = data.get("dns", {})
         for iface, info in dns.items():
             if not iface:
                 continue
             if info.get("dhcp", False):
-                run_netsh(f'netsh interface ipv4 set dns name="{iface}" source=dhcp')
+                run_netsh(["interface", "ipv4", "set", "dns", f"name={iface}", "source=dhcp"])
             else:
                 servers = info.get("servers", [])
                 if servers:
-                    run_netsh(f'netsh interface ipv4 set dns name="{iface}" static {servers[0]} primary')
+                    run_netsh(["interface", "ipv4", "set", "dns", f"name={iface}", "static", servers[0], "primary"])
                     for idx, s in enumerate(servers[1:], start=2):
-                        run_netsh(f'netsh interface ipv4 add dns name="{iface}" {s} index={idx}')
+                        run_netsh(["interface", "ipv4", "add", "dns", f"name={iface}", s, f"index={idx}"])
         # Restore power
         power = data.get("power")
         if power:
-            run_cmd(f'powercfg /setactive {power}', timeout=6)
+            run_cmd(["powercfg", "/setactive", power], timeout=6)
         log("Restored settings from backup")
         return True
     except Exception as e:
@@ -180,101 +294,114 @@ def restore_from_backup():
 # ------------------------------------------------------------
 # Optimizations (Safe & Reversible)
 # ------------------------------------------------------------
+# netsh lines for the "on" state of the TCP and low-latency optimizers
+_TCP_TWEAK_LINES = (
+    "interface tcp set global autotuninglevel=normal",
+    "interface tcp set global ecncapability=enabled",
+    "interface tcp set global rss=enabled",
+    "interface tcp set global chimney=disabled",  # modern Windows often prefers chimney disabled
+)
+_LOW_LATENCY_LINES = (
+    "interface tcp set global congestionprovider=ctcp",
+    "interface tcp set global timestamps=disabled",
+)
+
 def apply_tcp_tweaks(enable, backup=True):
-    if not is_windows(): return 1, "Unsupported"
     try:
         if backup:
             backup_settings()
         # These are safe Microsoft-supported settings
         if enable:
-            run_netsh("netsh interface tcp set global autotuninglevel=normal")
-            run_netsh("netsh interface tcp set global ecncapability=enabled")
-            run_netsh("netsh interface tcp set global rss=enabled")
-            run_netsh("netsh interface tcp set global chimney=disabled")  # modern Windows often prefers chimney disabled
+            code, out = run_netsh_batch(_TCP_TWEAK_LINES)
         else:
             # Try restore from backup if available, otherwise set sensible defaults
-            if BACKUP_FILE.exists():
-                if restore_from_backup():
-                    return 0, "TCP tweaks restored from backup"
-            run_netsh("netsh interface tcp set global autotuninglevel=normal")
-            run_netsh("netsh interface tcp set global ecncapability=default")
-            run_netsh("netsh interface tcp set global rss=default")
-            run_netsh("netsh interface tcp set global chimney=disabled")
+            if restore_from_backup():
+                return 0, "TCP tweaks restored from backup"
+            code, out = run_netsh_batch([
+                "interface tcp set global autotuninglevel=normal",
+                "interface tcp set global ecncapability=default",
+                "interface tcp set global rss=default",
+                "interface tcp set global chimney=disabled",
+            ])
+        if code != 0:
+            return code, "Partially applied, failed: " + out
         return 0, "TCP tweaks applied"
     except Exception as e:
         return 1, str(e)
 
 def set_low_latency_mode(enable, backup=True):
-    if not is_windows(): return 1, "Unsupported"
     try:
         if backup:
             backup_settings()
         if enable:
-            run_netsh("netsh interface tcp set global congestionprovider=ctcp")
-            run_netsh("netsh interface tcp set global timestamps=disabled")
+            code, out = run_netsh_batch(_LOW_LATENCY_LINES)
         else:
             # prefer restore from backup if possible
-            if BACKUP_FILE.exists():
-                with open(BACKUP_FILE, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                tcp = data.get("tcp_globals", {})
-                cp = tcp.get("congestionprovider")
-                ts = tcp.get("timestamps")
+            data = load_backup()
+            if data is not None:
+                tcp = TcpGlobals.from_dict(data.get("tcp_globals"))
+                cp = tcp.congestionprovider
+                ts = tcp.timestamps
+                cmds = []
                 if cp:
-                    run_netsh(f'netsh interface tcp set global congestionprovider={cp}')
+                    cmds.append(f'interface tcp set global congestionprovider={cp}')
                 if ts:
-                    run_netsh(f'netsh interface tcp set global timestamps={ts}')
+                    cmds.append(f'interface tcp set global timestamps={ts}')
+                code, out = run_netsh_batch(cmds)
+                if code != 0:
+                    return code, "Partially restored, failed: " + out
                 return 0, "Low latency settings restored"
-            run_netsh("netsh interface tcp set global congestionprovider=none")
-            run_netsh("netsh interface tcp set global timestamps=enabled")
+            code, out = run_netsh_batch([
+                "interface tcp set global congestionprovider=none",
+                "interface tcp set global timestamps=enabled",
+            ])
+        if code != 0:
+            return code, "Partially applied, failed: " + out
         return 0, "Low latency applied"
     except Exception as e:
         return 1, str(e)
 
-def apply_dns_mode(enable, iface):
-    if not is_windows():
-        return 1, "Unsupported"
+def apply_dns_mode(enable, iface, backup=True):
     try:
         name = iface or "Ethernet"
         # Backup current DNS for interface
-        backup_settings(iface=name)
+        if backup:
+            backup_settings(iface=name)
         # Prefer ipv4 explicit command; some Windows accept both
         if enable:
-            run_netsh(f'netsh interface ipv4 set dns name="{name}" static 8.8.8.8 primary')
-            run_netsh(f'netsh interface ipv4 add dns name="{name}" 8.8.4.4 index=2')
-            run_netsh('ipconfig /flushdns')
+            run_netsh(["interface", "ipv4", "set", "dns", f"name={name}", "static", "8.8.8.8", "primary"])
+            run_netsh(["interface", "ipv4", "add", "dns", f"name={name}", "8.8.4.4", "index=2"])
+            flush_dns()
         else:
             # restore from backup if available
-            if BACKUP_FILE.exists():
-                with open(BACKUP_FILE, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+            data = load_backup()
+            if data is not None:
                 dns = data.get("dns", {}).get(name)
                 if dns:
                     if dns.get("dhcp", False):
-                        run_netsh(f'netsh interface ipv4 set dns name="{name}" source=dhcp')
+                        run_netsh(["interface", "ipv4", "set", "dns", f"name={name}", "source=dhcp"])
                     else:
                         servers = dns.get("servers", [])
                         if servers:
-                            run_netsh(f'netsh interface ipv4 set dns name="{name}" static {servers[0]} primary')
+                            run_netsh(["interface", "ipv4", "set", "dns", f"name={name}", "static", servers[0], "primary"])
                             for idx, s in enumerate(servers[1:], start=2):
-                                run_netsh(f'netsh interface ipv4 add dns name="{name}" {s} index={idx}')
-                    run_netsh('ipconfig /flushdns')
+                                run_netsh(["interface", "ipv4", "add", "dns", f"name={name}", s, f"index={idx}"])
+                    flush_dns()
                     return 0, "DNS restored from backup"
             # fallback
-            run_netsh(f'netsh interface ipv4 set dns name="{name}" source=dhcp')
-            run_netsh('ipconfig /flushdns')
+            run_netsh(["interface", "ipv4", "set", "dns", f"name={name}", "source=dhcp"])
+            flush_dns()
         return 0, "DNS mode applied"
     except Exception as e:
         return 1, str(e)
 
-def set_power_plan(high_perf):
-    if not is_windows():
-        return 1, "Unsupported"
+def set_power_plan(high_perf, backup=True):
     try:
         # Backup current power plan
-        backup_settings()
+        if backup:
+            backup_settings()
         guid = HIGH_PERF_GUID if high_perf else BALANCED_GUID
-        code, out = run_cmd(f'powercfg /setactive {guid}', timeout=6)
+        code, out = run_cmd(["powercfg", "/setactive", guid], timeout=6)
         return (0, "Power plan set") if code == 0 else (1, out)
     except Exception as e:
         return 1, str(e)
@@ -282,82 +409,182 @@ def set_power_plan(high_perf):
 # ------------------------------------------------------------
 # Configuration
 # ------------------------------------------------------------
-def save_config():
-    cfg = {
+def current_config():
+    """Snapshot the UI toggles as a config dict (reads Tk variables, so UI thread only)."""
+    return {
         "low_latency": bool(low_latency_var.get()),
         "dns_mode": bool(dns_var.get()),
         "power_high": bool(power_var.get()),
-        "interface": iface_var.get()
+        "interface": selected_iface()
     }
+
+def save_config(cfg):
+    """Write cfg to the config file; touches no widgets, so it's safe on a worker thread."""
     try:
-        with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-            json.dump(cfg, f, indent=2)
-        status_var.set("Settings saved")
+        write_config_file(CONFIG_FILE, _dumps(cfg))
         log("Config saved: " + json.dumps(cfg))
     except Exception as e:
-        status_var.set("Save failed")
         log("Save failed: " + str(e))
 
 def load_config():
+    global _saved_iface
     try:
-        if CONFIG_FILE.exists():
-            with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            low_latency_var.set(bool(data.get("low_latency", False)))
-            dns_var.set(bool(data.get("dns_mode", False)))
-            power_var.set(bool(data.get("power_high", False)))
-            iface = data.get("interface", "")
-            if iface and iface in iface_list:
-                iface_var.set(iface)
-            status_var.set("Config loaded")
+        data = load_json_cached(CONFIG_FILE)
+        low_latency_var.set(bool(data.get("low_latency", False)))
+        dns_var.set(bool(data.get("dns_mode", False)))
+        power_var.set(bool(data.get("power_high", False)))
+        iface = data.get("interface", "")
+        if iface and iface in iface_list:
+            iface_var.set(iface)
+        # Interfaces may still be detecting; remember the choice so it can be applied once they arrive
+        _saved_iface = iface
+        status_var.set("Config loaded")
+    except FileNotFoundError:
+        pass
     except Exception as e:
         status_var.set("Config load failed")
         log("Load config failed: " + str(e))
 
+# Shown in the interface menu until the background detection finishes
+IFACE_PLACEHOLDER = "(detecting...)"
+_saved_iface = ""
+
+def selected_iface():
+    """Interface chosen in the menu, or the saved one while detection is still running."""
+    iface = iface_var.get()
+    return _saved_iface if iface == IFACE_PLACEHOLDER else iface
+
+def detect_interfaces_async():
+    """List interfaces on a worker thread so the window paints first, then fill the menu on the UI thread."""
+    threading.Thread(target=lambda: app.after(0, _set_interfaces, list_interfaces()), daemon=True).start()
+
+def _set_interfaces(names):
+    global iface_list
+    iface_list = names
+    iface_menu.configure(values=names or [""])
+    if _saved_iface in names:
+        iface_var.set(_saved_iface)
+    else:
+        iface_var.set(names[0] if names else "")
+
 # ------------------------------------------------------------
 # Button Handlers
 # ------------------------------------------------------------
-def apply_all():
+def require_admin():
+    """Warn and return False when running unelevated on Windows, before any netsh/powercfg call is attempted."""
+    if IS_WINDOWS and not IS_ADMIN:
+        status_var.set("Administrator rights required")
+        messagebox.showwarning("DelayKiller Lite", "Administrator rights are required to change network and power settings.\n\nRestart DelayKiller Lite as administrator.")
+        return False
+    return True
+
+# Set while an Apply/Reset worker is running so repeated clicks don't start a second one
+_busy = False
+
+def run_in_background(work, done, failed):
+    """Run work() on a daemon thread, then call done(result) or failed(exc, tb) on the UI thread via app.after."""
+    global _busy
+    if _busy:
+        return False
+    _busy = True
+
+    def _worker():
+        global _busy
+        try:
+            result = work()
+        except Exception as e:
+            args = (failed, e, traceback.format_exc())
+        else:
+            args = (done, result)
+        try:
+            app.after(0, _finish, *args)
+        except Exception:
+            # the window is gone or Tk refused the call; don't leave the lock held
+            _busy = False
+
+    threading.Thread(target=_worker, daemon=True).start()
+    return True
+
+def _finish(callback, *args):
+    global _busy
     try:
-        save_config()
-        log("Apply started")
+        callback(*args)
+    finally:
+        _busy = False
+
+def _apply_tcp_and_latency(low_latency):
+    """Run the TCP and low-latency optimizers in order on one worker; both write `tcp set global`."""
+    tcp = apply_tcp_tweaks(True, backup=False)
+    # with low latency off the backup apply_all just took already holds the current
+    # congestionprovider/timestamps values, so there is nothing to restore
+    latency = set_low_latency_mode(True, backup=False) if low_latency else (0, "Unchanged")
+    return tcp, latency
+
+def apply_all():
+    if not require_admin():
+        return
+    log("Apply started")
+    # Tk variables are read here on the UI thread; the worker never touches the GUI
+    cfg = current_config()
+    iface = cfg["interface"]
+    low_latency = cfg["low_latency"]
+    dns_mode = cfg["dns_mode"]
+    power_high = cfg["power_high"]
+
+    def work():
+        save_config(cfg)
         # create a backup before making any changes
-        backup_settings(iface=iface_var.get())
-        r1, o1 = apply_tcp_tweaks(True, backup=False)
-        r2, o2 = set_low_latency_mode(low_latency_var.get(), backup=False)
-        r3, o3 = apply_dns_mode(dns_var.get(), iface_var.get())
-        r4, o4 = set_power_plan(power_var.get())
+        backup_settings(iface=iface)
+        # DNS and power are independent and run alongside the TCP task
+        with ThreadPoolExecutor(max_workers=3) as ex:
+            f1 = ex.submit(_apply_tcp_and_latency, low_latency)
+            f2 = ex.submit(apply_dns_mode, dns_mode, iface, backup=False)
+            f3 = ex.submit(set_power_plan, power_high, backup=False)
+            ((r1, o1), (r2, o2)), (r3, o3), (r4, o4) = f1.result(), f2.result(), f3.result()
+        return "\n".join([f"TCP: {o1}", f"Latency: {o2}", f"DNS: {o3}", f"Power: {o4}"])
+
+    def done(msg):
         status_var.set("Optimized Successfully")
-        msg = "\n".join([f"TCP: {o1}", f"Latency: {o2}", f"DNS: {o3}", f"Power: {o4}"])
         log("Apply results: " + msg.replace("\n", " | "))
         messagebox.showinfo("DelayKiller Lite", "Optimizations Applied!\n\n" + msg)
-    except Exception as e:
+
+    def failed(e, tb):
         status_var.set("Apply failed")
-        log("Apply failed: " + traceback.format_exc())
+        log("Apply failed: " + tb)
         messagebox.showerror("DelayKiller Lite", "Apply failed:\n" + str(e))
 
+    if run_in_background(work, done, failed):
+        status_var.set("Applying optimizations...")
+
 def reset_all():
-    try:
-        log("Reset started")
+    if not require_admin():
+        return
+    log("Reset started")
+    iface = selected_iface()
+
+    def work():
         # Prefer restoring from backup
-        if BACKUP_FILE.exists():
-            ok = restore_from_backup()
-            if ok:
-                status_var.set("Settings Restored from backup")
-                messagebox.showinfo("DelayKiller Lite", "Settings Restored from backup")
-                return
+        if restore_from_backup():
+            return "Settings Restored from backup"
         # Fallback: apply safe defaults
         apply_tcp_tweaks(False, backup=False)
         set_low_latency_mode(False, backup=False)
-        apply_dns_mode(False, iface_var.get())
-        set_power_plan(False)
-        status_var.set("Settings Reset")
-        messagebox.showinfo("DelayKiller Lite", "Settings Restored")
-    except Exception as e:
+        apply_dns_mode(False, iface, backup=False)
+        set_power_plan(False, backup=False)
+        return None
+
+    def done(restored_msg):
+        status_var.set(restored_msg or "Settings Reset")
+        messagebox.showinfo("DelayKiller Lite", restored_msg or "Settings Restored")
+
+    def failed(e, tb):
         status_var.set("Reset failed")
-        log("Reset failed: " + traceback.format_exc())
+        log("Reset failed: " + tb)
         messagebox.showerror("DelayKiller Lite", "Reset failed:\n" + str(e))
 
+    if run_in_background(work, done, failed):
+        status_var.set("Resetting settings...")
+
 def open_discord():
     webbrowser.open("https://discord.gg/T8GFc6ryGy")
 
@@ -374,10 +601,13 @@ def show_help():
 # ---------------------------
 # Added: command helpers, interface listing, defaults
 # ---------------------------
-def run_cmd(cmd, timeout=10):
-    """Run shell command and return (returncode, stdout)."""
+# Hide the console window of child processes on Windows
+_NO_WINDOW = subprocess.CREATE_NO_WINDOW if IS_WINDOWS else 0
+
+def run_cmd(argv, timeout=10):
+    """Run a command given as an argv list (no shell) and return (returncode, stdout)."""
     try:
-        proc = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=timeout)
+        proc = subprocess.run(argv, shell=False, capture_output=True, text=True, timeout=timeout, creationflags=_NO_WINDOW)
         out = (proc.stdout or "").strip()
         # include stderr when stdout empty to aid debugging
         if not out and proc.stderr:
@@ -388,38 +618,170 @@ def run_cmd(cmd, timeout=10):
     except Exception as e:
         return 1, str(e)
 
-def run_netsh(cmd):
-    """Convenience wrapper for netsh commands that returns (code, output). Accepts either full command or args."""
-    # Accept either "netsh ..." or just the args
-    full = cmd if cmd.strip().lower().startswith("netsh") else f"netsh {cmd}"
-    return run_cmd(full, timeout=8)
+def run_netsh(args):
+    """Convenience wrapper for netsh commands that returns (code, output). Takes the netsh arguments as an argv list."""
+    return run_cmd(["netsh"] + list(args), timeout=8)
+
+def run_netsh_batch(cmds):
+    """Run several netsh commands with a single `netsh -f` script and return (code, output) for the batch.
+
+    netsh stops a script at the first line it rejects (e.g. `chimney` on current Windows),
+    so on a non-zero exit every line is re-run on its own and the output lists the ones that failed.
+    """
+    lines = [c.strip() for c in cmds if c.strip()]
+    if not lines:
+        return 0, ""
+    fd, script = tempfile.mkstemp(prefix="dk_netsh_", suffix=".txt")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        code, out = run_cmd(["netsh", "-f", script], timeout=8 * len(lines))
+    finally:
+        try:
+            os.remove(script)
+        except OSError:
+            pass
+    if code == 0:
+        return code, out
+    failed = []
+    for line in lines:
+        c, o = run_netsh(line.split())
+        if c != 0:
+            failed.append(f"{line}: {o or c}")
+    return (1, "; ".join(failed)) if failed else (0, "")
+
+def flush_dns():
+    """Flush the resolver cache in-process via dnsapi (same effect as `ipconfig /flushdns`)."""
+    try:
+        if ctypes.windll.dnsapi.DnsFlushResolverCache():
+            return 0, "DNS cache flushed"
+    except Exception:
+        pass
+    return run_cmd(["ipconfig", "/flushdns"])
+
+# Minimal iphlpapi structures: only the leading fields we read are declared,
+# the records are accessed in place inside the buffer filled by the API.
+class _SOCKET_ADDRESS(ctypes.Structure):
+    _fields_ = [("lpSockaddr", ctypes.c_void_p), ("iSockaddrLength", ctypes.c_int)]
+
+class _IP_ADAPTER_DNS_SERVER_ADDRESS(ctypes.Structure):
+    pass
+
+_IP_ADAPTER_DNS_SERVER_ADDRESS._fields_ = [
+    ("Length", ctypes.c_ulong),
+    ("Reserved", ctypes.c_ulong),
+    ("Next", ctypes.POINTER(_IP_ADAPTER_DNS_SERVER_ADDRESS)),
+    ("Address", _SOCKET_ADDRESS),
+]
+
+class _IP_ADAPTER_ADDRESSES(ctypes.Structure):
+    pass
+
+_IP_ADAPTER_ADDRESSES._fields_ = [
+    ("Length", ctypes.c_ulong),
+    ("IfIndex", ctypes.c_ulong),
+    ("Next", ctypes.POINTER(_IP_ADAPTER_ADDRESSES)),
+    ("AdapterName", ctypes.c_char_p),
+    ("FirstUnicastAddress", ctypes.c_void_p),
+    ("FirstAnycastAddress", ctypes.c_void_p),
+    ("FirstMulticastAddress", ctypes.c_void_p),
+    ("FirstDnsServerAddress", ctypes.POINTER(_IP_ADAPTER_DNS_SERVER_ADDRESS)),
+    ("DnsSuffix", ctypes.c_wchar_p),
+    ("Description", ctypes.c_wchar_p),
+    ("FriendlyName", ctypes.c_wchar_p),
+    ("PhysicalAddress", ctypes.c_ubyte * 8),
+    ("PhysicalAddressLength", ctypes.c_ulong),
+    ("Flags", ctypes.c_ulong),
+    ("Mtu", ctypes.c_ulong),
+    ("IfType", ctypes.c_ulong),
+    ("OperStatus", ctypes.c_int),
+]
+
+AF_UNSPEC = 0
+AF_INET = 2
+GAA_FLAG_SKIP_ANYCAST = 0x2
+GAA_FLAG_SKIP_MULTICAST = 0x4
+ERROR_BUFFER_OVERFLOW = 111
+IF_TYPE_SOFTWARE_LOOPBACK = 24
+IF_TYPE_TUNNEL = 131
+
+def get_adapters():
+    """Return [(friendly_name, adapter_guid, [ipv4 dns servers])] via GetAdaptersAddresses, or None on failure."""
+    try:
+        size = ctypes.c_ulong(15000)
+        for _ in range(3):
+            buf = ctypes.create_string_buffer(size.value)
+            rc = ctypes.windll.iphlpapi.GetAdaptersAddresses(
+                AF_UNSPEC, GAA_FLAG_SKIP_ANYCAST | GAA_FLAG_SKIP_MULTICAST, None, buf, ctypes.byref(size))
+            if rc != ERROR_BUFFER_OVERFLOW:
+                break
+        if rc != 0:
+            return None
+        adapters = []
+        p = ctypes.cast(buf, ctypes.POINTER(_IP_ADAPTER_ADDRESSES))
+        while p:
+            a = p.contents
+            if a.IfType not in (IF_TYPE_SOFTWARE_LOOPBACK, IF_TYPE_TUNNEL) and a.FriendlyName:
+                servers = []
+                d = a.FirstDnsServerAddress
+                while d:
+                    addr = d.contents.Address
+                    if addr.lpSockaddr:
+                        raw = ctypes.string_at(addr.lpSockaddr, addr.iSockaddrLength)
+                        # sockaddr_in: family (u16), port (u16), 4 address bytes
+                        if len(raw) >= 8 and int.from_bytes(raw[:2], "little") == AF_INET:
+                            servers.append(".".join(str(b) for b in raw[4:8]))
+                    d = d.contents.Next
+                guid = (a.AdapterName or b"").decode("ascii", "ignore")
+                adapters.append((a.FriendlyName, guid, servers))
+            p = a.Next
+        return adapters
+    except Exception as e:
+        log("GetAdaptersAddresses failed: " + str(e))
+        return None
+
+def _has_static_dns(adapter_guid):
+    """True when the adapter has manually configured DNS servers (NameServer set in the registry)."""
+    try:
+        import winreg
+        path = rf"SYSTEM\CurrentControlSet\Services\Tcpip\Parameters\Interfaces\{adapter_guid}"
+        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, path, 0, winreg.KEY_READ) as k:
+            val, _ = winreg.QueryValueEx(k, "NameServer")
+        return bool(str(val).strip())
+    except OSError:
+        return False
 
 def list_interfaces():
     """Return list of network interface names (best-effort)."""
-    if not is_windows():
-        return []
-    code, out = run_netsh("interface show interface")
+    adapters = get_adapters()
+    if adapters:
+        return [name for name, _, _ in adapters]
+    # Fallback: one structured PowerShell query instead of scraping netsh tables
+    code, out = run_cmd(["powershell", "-NoProfile", "-NonInteractive", "-Command",
+                         "Get-NetAdapter | Select-Object Name | ConvertTo-Json -Compress"], timeout=8)
     if code != 0 or not out:
-        # Try 'netsh interface ipv4 show interfaces' as fallback
-        code, out = run_netsh("interface ipv4 show interfaces")
-        if code != 0 or not out:
-            return []
-    names = []
-    # Try to parse lines that contain the interface name at the end
-    for line in out.splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        # Patterns: 'Enabled    Connected   Dedicated    Ethernet' or 'Idx     Met         MTU          Name'
-        m = re.search(r'\b([^\r\n]{3,})$', line)
-        if m:
-            candidate = m.group(1).strip()
-            # Filter out header lines
-            if candidate.lower() not in ("admin state", "state", "name", "idx", "interface"):
-                # avoid repeated entries
-                if candidate not in names:
-                    names.append(candidate)
-    return names
+        return []
+    try:
+        data = json.loads(out)
+    except ValueError:
+        return []
+    # ConvertTo-Json emits a bare object instead of a list when there is a single adapter
+    if isinstance(data, dict):
+        data = [data]
+    return [d["Name"] for d in data if isinstance(d, dict) and d.get("Name")]
+
+# The backends above drive Windows-only tools. Elsewhere, bind no-op stubs once
+# at import instead of re-checking the platform on every call.
+if not IS_WINDOWS:
+    def _unsupported(*args, **kwargs):
+        return 1, "Unsupported"
+
+    apply_tcp_tweaks = set_low_latency_mode = apply_dns_mode = set_power_plan = _unsupported
+    get_tcp_globals = lambda: TcpGlobals()
+    get_dns_info = lambda iface: {"dhcp": False, "servers": []}
+    get_active_power_guid = lambda: None
+    get_adapters = lambda: None
+    list_interfaces = lambda: []
 
 # sensible defaults & fallbacks for resources and UI constants (prevents NameError)
 LOGO_PATH = resource_path("logo.ico") if 'resource_path' in globals() else ""
@@ -444,7 +806,7 @@ BALANCED_GUID = "381b4222-f694-41f0-9685-ff5bb260df2e"
 app = ctk.CTk()
 app.geometry("640x460")
 app.title("DelayKiller Lite")
-if LOGO_PATH and os.path.exists(LOGO_PATH) and is_windows():
+if LOGO_PATH and os.path.exists(LOGO_PATH) and IS_WINDOWS:
     try:
         app.iconbitmap(LOGO_PATH)
     except Exception:
@@ -456,8 +818,8 @@ low_latency_var = ctk.BooleanVar(value=False)
 dns_var = ctk.BooleanVar(value=False)
 power_var = ctk.BooleanVar(value=False)
 status_var = ctk.StringVar(value="Ready")
-iface_list = list_interfaces()
-iface_var = ctk.StringVar(value=iface_list[0] if iface_list else "")
+iface_list = []  # filled by detect_interfaces_async() once the window is up
+iface_var = ctk.StringVar(value=IFACE_PLACEHOLDER)
 
 # Main layout
 main = ctk.CTkFrame(app, fg_color=BG, corner_radius=0)
@@ -472,6 +834,7 @@ header_left.pack(side="left", padx=12, pady=12)
 # Logo
 try:
     if LOGO_PATH and os.path.exists(LOGO_PATH):
+        from PIL import Image, ImageTk
         logo_img = Image.open(LOGO_PATH).resize((76, 76))
         logo = ImageTk.PhotoImage(logo_img)
         ctk.CTkLabel(header_left, image=logo, text="", fg_color=CARD).pack()
@@ -500,7 +863,7 @@ ctk.CTkCheckBox(left_col, text="High Performance Power Plan", variable=power_var
 
 # Interface selector
 ctk.CTkLabel(left_col, text="Network Interface:", font=FONT_SMALL, text_color=SUBTEXT).pack(anchor="w", pady=(12,4))
-iface_menu = ctk.CTkOptionMenu(left_col, values=iface_list, variable=iface_var, dropdown_hover_color=BUTTON_HOVER, button_color=BUTTON_BG, text_color=TEXT)
+iface_menu = ctk.CTkOptionMenu(left_col, values=[IFACE_PLACEHOLDER], variable=iface_var, dropdown_hover_color=BUTTON_HOVER, button_color=BUTTON_BG, text_color=TEXT)
 iface_menu.pack(anchor="w", pady=(0,10))
 
 # Right column (buttons + status)
@@ -526,6 +889,7 @@ ctk.CTkButton(status_frame, text="Open Log", width=100, height=26, fg_color=BUTT
 # Load config and start
 try:
     load_config()
+    detect_interfaces_async()
     app.mainloop()
 except Exception:
     # Ensure the error is logged for inspection
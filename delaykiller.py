@@ -24,9 +24,12 @@ import sys
 import time
 import json
 import ctypes
+import socket
 import threading
+import functools
 import subprocess
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from tkinter import messagebox
 
 try:
@@ -45,6 +48,11 @@ except Exception:
     Image = None
     ImageTk = None
 
+try:
+    import orjson
+except Exception:
+    orjson = None
+
 IS_WINDOWS = sys.platform.startswith("win")
 
 APP_NAME = "DelayKiller Premium"
@@ -78,7 +86,9 @@ DEFAULT_CONFIG = {
 
 # --------------------------- Utilities ---------------------------
 
+@functools.lru_cache(maxsize=1)
 def is_admin():
+    # elevation can't change while the process runs, so the Win32 call is made once
     if not IS_WINDOWS:
         return False
     try:
@@ -87,9 +97,15 @@ def is_admin():
         return False
 
 
-def run_cmd(cmd, timeout=20):
+# keep child consoles from flashing up on Windows
+_NO_WINDOW = subprocess.CREATE_NO_WINDOW if IS_WINDOWS else 0
+
+
+def run_cmd(argv, timeout=20):
+    # argv is a list; the program is started directly, without a cmd.exe in between
     try:
-        p = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        p = subprocess.Popen(argv, shell=False, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                             creationflags=_NO_WINDOW)
         out, _ = p.communicate(timeout=timeout)
         return p.returncode, (out or "").strip()
     except subprocess.TimeoutExpired:
@@ -99,10 +115,18 @@ def run_cmd(cmd, timeout=20):
         return 1, str(e)
 
 
+def _dump(obj, f):
+    # orjson is C-backed; the stdlib fallback skips indent=2, which forces json's slow pure-Python encoder
+    if orjson is not None:
+        f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode())
+    else:
+        json.dump(obj, f)
+
+
 def save_config(cfg):
     try:
         with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-            json.dump(cfg, f, indent=2)
+            _dump(cfg, f)
         return True
     except Exception:
         return False
@@ -125,7 +149,7 @@ def backup_text(name, content):
     path = BACKUP_DIR / f"{time.strftime('%Y%m%d_%H%M%S')}_{name}.json"
     try:
         with open(path, "w", encoding="utf-8") as f:
-            json.dump(content, f, indent=2)
+            _dump(content, f)
         return str(path)
     except Exception:
         return None
@@ -135,29 +159,48 @@ def backup_text(name, content):
 def dns_flush():
     if not IS_WINDOWS:
         return 1, "Unsupported"
-    return run_cmd("ipconfig /flushdns", timeout=10)
+    return run_cmd(["ipconfig", "/flushdns"], timeout=10)
+
+
+# Minimal recursive query for the root zone ('.', type NS, class IN); the first two bytes are the query ID
+_DNS_ROOT_NS_QUERY = b"\x01\x00\x00\x01\x00\x00\x00\x00\x00\x00\x00\x00\x02\x00\x01"
+
+
+def _dns_probe(server, timeout=2):
+    """Send one DNS query to server:53 over UDP and return the response time in ms, or None."""
+    qid = os.urandom(2)
+    try:
+        # resolve the address family so IPv6 servers are probed too
+        family, _, _, _, addr = socket.getaddrinfo(server, 53, type=socket.SOCK_DGRAM)[0]
+        with socket.socket(family, socket.SOCK_DGRAM) as sock:
+            sock.settimeout(timeout)
+            start = time.perf_counter()
+            sock.sendto(qid + _DNS_ROOT_NS_QUERY, addr)
+            while True:
+                data, _ = sock.recvfrom(512)
+                # ignore stray datagrams that don't answer our query
+                if data[:2] == qid:
+                    return int((time.perf_counter() - start) * 1000)
+    except OSError:
+        return None
 
 
 def dns_benchmark(servers, timeout=2, count=3):
-    results = {}
-    if not IS_WINDOWS:
-        for s in servers:
-            results[s] = None
+    """Average DNS response time in ms per server (None if it never answered)."""
+    results = {s: None for s in servers}
+    if not servers or count < 1:
         return results
-    for s in servers:
-        try:
-            code, out = run_cmd(f"ping -n {count} -w {int(timeout*1000)} {s}", timeout=10)
-            avg = None
-            for line in out.splitlines():
-                if "Average =" in line or "Average" in line:
-                    parts = line.replace(" ", "").split("=")
-                    try:
-                        avg = int(parts[-1].replace("ms", ""))
-                    except Exception:
-                        avg = None
-            results[s] = avg
-        except Exception:
-            results[s] = None
+    samples = {s: [] for s in servers}
+    # every probe just waits on the network, so send all servers x count probes at once
+    with ThreadPoolExecutor(max_workers=min(32, len(servers) * count)) as ex:
+        futs = {ex.submit(_dns_probe, s, timeout): s for s in servers for _ in range(count)}
+        for fut in as_completed(futs):
+            ms = fut.result()
+            if ms is not None:
+                samples[futs[fut]].append(ms)
+    for s, vals in samples.items():
+        if vals:
+            results[s] = sum(vals) // len(vals)
     return results
 
 
@@ -166,10 +209,10 @@ def set_dns_interface(adapter_name, primary, secondary=None):
         return 1, "Unsupported"
     if not is_admin():
         return 2, "Admin required"
-    cmd = f'netsh interface ip set dns name="{adapter_name}" static {primary} validate=no'
+    cmd = ["netsh", "interface", "ip", "set", "dns", f"name={adapter_name}", "static", primary, "validate=no"]
     code, out = run_cmd(cmd)
     if secondary:
-        cmd2 = f'netsh interface ip add dns name="{adapter_name}" {secondary} index=2'
+        cmd2 = ["netsh", "interface", "ip", "add", "dns", f"name={adapter_name}", secondary, "index=2"]
         c2, o2 = run_cmd(cmd2)
         return code or c2, out + "\n" + o2
     return code, out
@@ -179,18 +222,23 @@ def set_dns_interface(adapter_name, primary, secondary=None):
 def probe_mtu(target="8.8.8.8", start=1500, min_mtu=1200):
     if not IS_WINDOWS:
         return None
-    mtu = start
-    step = 10
-    last_good = None
-    while mtu >= min_mtu:
-        payload = mtu - 28
-        cmd = f"ping -f -l {payload} -n 1 {target}"
-        code, out = run_cmd(cmd, timeout=4)
-        if code == 0 and "Reply" in out:
-            last_good = mtu
-            break
-        mtu -= step
-    return last_good
+    # binary search for the largest MTU whose DF ping gets through (~9 probes instead of up to 30)
+    lo, hi, best = min_mtu, start, None
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        payload = mid - 28  # 20 bytes IP header + 8 bytes ICMP header
+        # -w 500: a silent path fails in half a second instead of waiting out the 4s guard
+        cmd = ["ping", "-f", "-l", str(payload), "-n", "1", "-w", "500", target]
+        code, out = run_cmd(cmd, timeout=2)
+        if "Packet needs to be fragmented" in out:
+            # definite "too big" from the local stack or a router on the path
+            hi = mid - 1
+        elif code == 0 and "Reply" in out:
+            best = mid
+            lo = mid + 1
+        else:
+            hi = mid - 1
+    return best
 
 
 def apply_mtu(adapter_name, mtu):
@@ -198,7 +246,7 @@ def apply_mtu(adapter_name, mtu):
         return 1, "Unsupported"
     if not is_admin():
         return 2, "Admin required"
-    cmd = f'netsh interface ipv4 set subinterface "{adapter_name}" mtu={mtu} store=persistent'
+    cmd = ["netsh", "interface", "ipv4", "set", "subinterface", adapter_name, f"mtu={mtu}", "store=persistent"]
     return run_cmd(cmd)
 
 # Network stack repair (safe sequence)
@@ -208,17 +256,23 @@ def repair_network_stack():
         return 1, "Unsupported"
     if not is_admin():
         return 2, "Admin required"
+    # The stack resets and the DHCP release/renew pair don't depend on each other,
+    # so the two groups run side by side; order is kept within each group.
+    group_a = [["netsh", "int", "ip", "reset"], ["netsh", "winsock", "reset"]]
+    group_b = [["ipconfig", "/release"], ["ipconfig", "/renew"]]
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        fa = ex.submit(_run_seq, group_a)
+        fb = ex.submit(_run_seq, group_b)
+        results = fa.result() + fb.result()
+    return 0, results
+
+
+def _run_seq(cmds, timeout=20):
     results = []
-    cmds = [
-        "netsh int ip reset",
-        "netsh winsock reset",
-        "ipconfig /release",
-        "ipconfig /renew",
-    ]
     for c in cmds:
-        code, out = run_cmd(c, timeout=20)
-        results.append({"cmd": c, "code": code, "out": out})
-    return 0, results
+        code, out = run_cmd(c, timeout=timeout)
+        results.append({"cmd": " ".join(c), "code": code, "out": out})
+    return results
 
 # Latency stabilizer & FPS tools & SmartGaming
 
@@ -236,22 +290,22 @@ def set_timer_resolution(ms=1):
 def set_power_plan_high():
     if not IS_WINDOWS:
         return 1, "Unsupported"
-    return run_cmd("powercfg /setactive SCHEME_MIN")
+    return run_cmd(["powercfg", "/setactive", "SCHEME_MIN"])
 
 
 def clean_temp_files():
     try:
-        temp = Path(os.getenv('TEMP', '/tmp'))
+        temp = os.getenv('TEMP', '/tmp')
         removed = 0
-        for p in temp.glob('*'):
-            try:
-                if p.is_file():
-                    p.unlink()
-                    removed += 1
-                elif p.is_dir():
+        # scandir entries carry the file type from the directory listing, so no extra stat per entry
+        with os.scandir(temp) as it:
+            for e in it:
+                try:
+                    if e.is_file(follow_symlinks=False):
+                        os.unlink(e.path)
+                        removed += 1
+                except OSError:
                     continue
-            except Exception:
-                continue
         return 0, f"Removed approx {removed} files from {temp}"
     except Exception as e:
         return 1, str(e)
@@ -264,14 +318,29 @@ COMMON_GAMES = {
     'fortnite': ['FortniteClient-Win64-Shipping.exe','FortniteLauncher.exe'],
 }
 
-def detect_games():
+# lowercased exe name -> game, built once so detection is a single dict lookup per process
+_EXE_TO_GAME = {exe.lower(): game for game, exes in COMMON_GAMES.items() for exe in exes}
+
+def scan_processes():
+    """One pass over the process table: {lowercased exe name: [pids]}."""
+    pids_by_name = {}
+    # raw pids + name() only; process_iter(attrs=...) builds a full info dict per process
+    for pid in psutil.pids():
+        try:
+            name = psutil.Process(pid).name().lower()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+        pids_by_name.setdefault(name, []).append(pid)
+    return pids_by_name
+
+def detect_games(procs=None):
+    if procs is None:
+        procs = scan_processes()
     found = {}
-    for proc in psutil.process_iter(attrs=('name','pid')):
-        name = (proc.info.get('name') or '').lower()
-        for game, procs in COMMON_GAMES.items():
-            for p in procs:
-                if p.lower() == name:
-                    found.setdefault(game, []).append(proc.info['pid'])
+    for name, pids in procs.items():
+        game = _EXE_TO_GAME.get(name)
+        if game:
+            found.setdefault(game, []).extend(pids)
     return found
 
 # --------------------------- UI (redesigned) ---------------------------
@@ -314,6 +383,7 @@ content_holder.pack(fill='both', expand=True, padx=18, pady=(12,18))
 pages = {}
 current_page = None
 page_width = 1060  # fallback width used by slide animations
+_content_w = page_width  # last content_holder width seen by on_resize (avoids a winfo query per slide)
 animating = False
 
 TAB_NAMES = ['Dashboard','Boost Engine','Network Tools','System Tools','Settings']
@@ -323,8 +393,11 @@ _active_tab_name = None
 _tab_props = {}
 
 # helper to animate slide between frames
-def slide_to(new_name, direction=1, steps=18, delay=12):
-    global current_page, animating
+# state of the running slide animation; _slide_step reads it instead of closing over locals
+_anim = {}
+
+def slide_to(new_name, direction=1, duration=0.2, frame_ms=16):
+    global animating
     # prevent re-entrant animations
     if animating:
         return
@@ -332,69 +405,59 @@ def slide_to(new_name, direction=1, steps=18, delay=12):
 
     try:
         new_frame = pages[new_name]
-        cw = content_holder.winfo_width() or page_width
+        cw = _content_w or page_width
         start_x = cw * direction
         prev_page = current_page
+        old_frame = pages.get(prev_page) if prev_page and prev_page != new_name else None
 
         new_frame.place(in_=content_holder, x=start_x, y=0, relheight=1, relwidth=1)
-
-        def step(i):
-            # ensure we can update globals on error/finalize
-            global current_page, animating
-            try:
-                frac = i / steps
-                x_new = int(start_x * (1 - frac))
-                try:
-                    new_frame.place_configure(x=x_new)
-                except Exception:
-                    pass
-
-                if prev_page and prev_page != new_name:
-                    old_frame = pages.get(prev_page)
-                    if old_frame:
-                        x_old = int(-cw * frac * direction)
-                        try:
-                            old_frame.place_configure(x=x_old)
-                        except Exception:
-                            pass
-
-                if i < steps:
-                    app.after(delay, lambda: step(i + 1))
-                else:
-                    # finalize: remove the captured previous page
-                    if prev_page and prev_page != new_name:
-                        try:
-                            pages[prev_page].place_forget()
-                        except Exception:
-                            pass
-                    try:
-                        new_frame.place_configure(x=0)
-                    except Exception:
-                        pass
-                    current_page = new_name
-                    animating = False
-            except Exception:
-                # strong cleanup on unexpected error during animation steps
-                try:
-                    new_frame.place_configure(x=0)
-                except Exception:
-                    pass
-                if prev_page and prev_page != new_name:
-                    try:
-                        pages[prev_page].place_forget()
-                    except Exception:
-                        pass
-                # ensure state is consistent so future switches are allowed
-                current_page = new_name
-                animating = False
-                return
-
-        step(0)
+        # position is derived from elapsed time, so a busy UI drops frames instead of slowing the slide
+        _anim.update(name=new_name, new_frame=new_frame, old_frame=old_frame, start_x=start_x,
+                     cw=cw, direction=direction, t0=time.perf_counter(), duration=duration, frame_ms=frame_ms)
+        _slide_step()
     except Exception:
         # ensure lock is cleared on unexpected immediate error so UI doesn't become stuck
         animating = False
         return
 
+def _slide_step():
+    # ensure we can update globals on error/finalize
+    global current_page, animating
+    a = _anim
+    new_frame, old_frame = a['new_frame'], a['old_frame']
+    try:
+        frac = min(1.0, (time.perf_counter() - a['t0']) / a['duration'])
+        try:
+            new_frame.place_configure(x=int(a['start_x'] * (1 - frac)))
+        except Exception:
+            pass
+
+        if old_frame:
+            try:
+                old_frame.place_configure(x=int(-a['cw'] * frac * a['direction']))
+            except Exception:
+                pass
+
+        if frac < 1.0:
+            app.after(a['frame_ms'], _slide_step)
+            return
+    except Exception:
+        # strong cleanup on unexpected error during animation steps (falls through to finalize)
+        pass
+    # finalize: remove the captured previous page
+    if old_frame:
+        try:
+            old_frame.place_forget()
+        except Exception:
+            pass
+    try:
+        new_frame.place_configure(x=0)
+    except Exception:
+        pass
+    # ensure state is consistent so future switches are allowed
+    current_page = a['name']
+    animating = False
+
 # hover-scale animation helpers for buttons (increase padding + font slightly)
 def attach_hover_scale(btn, scale=1.08):
     # store original properties
@@ -482,9 +545,23 @@ status_label.pack(side='right', padx=18)
 log_box = ctk.CTkTextbox(app, height=120, fg_color=COL_CARD, text_color=COL_TEXT)
 log_box.pack(side='bottom', fill='x', padx=18, pady=(0,12))
 
+# Log lines are buffered and written to the textbox in one insert every 100ms,
+# so bursts of messages cost one relayout and worker threads never touch the widget.
+_log_buf = []
+
 def add_log(text):
-    log_box.insert('end', text + "\n")
-    log_box.see('end')
+    _log_buf.append(text)
+
+def _flush_log():
+    n = len(_log_buf)
+    if n:
+        chunk = _log_buf[:n]
+        del _log_buf[:n]
+        log_box.insert('end', "\n".join(chunk) + "\n")
+        log_box.see('end')
+    app.after(100, _flush_log)
+
+app.after(100, _flush_log)
 
 # ------------------- Build pages (content) -------------------
 # Dashboard
@@ -587,14 +664,11 @@ def run_repair_stack():
             snap = {}
             try:
                 with winreg.OpenKey(base, tcp_path, 0, winreg.KEY_READ) as k:
-                    i = 0
-                    while True:
-                        try:
-                            name, val, _ = winreg.EnumValue(k, i)
-                            snap[name] = val
-                            i += 1
-                        except OSError:
-                            break
+                    # QueryInfoKey gives the value count up front, so no OSError ends the loop
+                    _, n_values, _ = winreg.QueryInfoKey(k)
+                    for i in range(n_values):
+                        name, val, _ = winreg.EnumValue(k, i)
+                        snap[name] = val
             except Exception:
                 snap['_error'] = 'read_failed'
             backup_text('tcp_parameters', snap)
@@ -623,14 +697,15 @@ def run_probe_mtu():
     add_log(f"Probe MTU -> {suggested}")
 
 def run_selected_boosts():
-    cfg = load_config()
     actions = []
     if dns_auto_var.get():
         actions.append(('dns', dns_flush))
     if mtu_auto_var.get():
         actions.append(('mtu', probe_mtu))
+    # one process snapshot (taken after confirmation) is shared by game detection and the Java priority pass
+    procs = None
     if smartgaming_var.get():
-        actions.append(('smartgaming', detect_games))
+        actions.append(('smartgaming', lambda: detect_games(procs)))
     if latstab_var.get():
         actions.append(('latstab', set_timer_resolution))
 
@@ -639,6 +714,9 @@ def run_selected_boosts():
         status_var.set('Cancelled')
         return
 
+    if smartgaming_var.get():
+        procs = scan_processes()
+
     for name, fn in actions:
         status_var.set(f'Running {name}...')
         try:
@@ -655,13 +733,13 @@ def run_selected_boosts():
             add_log(f"{name} failed: {e}")
 
     if smartgaming_var.get():
-        games = detect_games()
+        games = detect_games(procs)
         games_list.delete('0.0','end')
         if games:
             for g,pids in games.items():
                 games_list.insert('end', f"{g}: {len(pids)} process(es)\n")
                 if g == 'minecraft':
-                    changed = set_java_priority('High')
+                    changed = set_java_priority('High', procs)
                     status_var.set(f'Increased Java priority for {changed} processes')
                     add_log(f"Java priority changed: {changed}")
         else:
@@ -693,31 +771,43 @@ def build_exe():
         status_var.set('Build cancelled')
         return
     status_var.set('Building EXE...')
-    spec = f"pyinstaller --noconsole --onefile --name \"{APP_NAME}\" \"{os.path.realpath(sys.argv[0])}\""
+    spec = ["pyinstaller", "--noconsole", "--onefile", "--name", APP_NAME, os.path.realpath(sys.argv[0])]
     code, out = run_cmd(spec, timeout=300)
     status_var.set('Build finished' if code==0 else f'Build failed: {out}')
     add_log(f"Build EXE -> {code}")
 
 # helpers (existing)
+# first-column words of netsh table header rows (`interface show interface`, `ipv4 show interfaces`)
+_ADAPTER_TABLE_HEADERS = frozenset({"admin", "idx"})
+
+# adapters rarely change, so reuse the last netsh listing for a short while
+_ADAPTERS_TTL = 30.0
+_adapters_cache = (0.0, None)
+
 def suggest_adapters_local():
+    global _adapters_cache
     if not IS_WINDOWS:
         return []
-    code, out = run_cmd('netsh interface show interface')
-    names = []
+    t, cached = _adapters_cache
+    now = time.monotonic()
+    if cached is not None and now - t < _ADAPTERS_TTL:
+        return list(cached)
+    code, out = run_cmd(["netsh", "interface", "show", "interface"])
+    # dict keeps insertion order and dedupes in O(1) per name
+    names = {}
     if code == 0:
         for line in out.splitlines():
-            line = line.strip()
-            if not line or line.startswith('Admin'):
-                continue
-            parts = line.split()
-            if len(parts) >= 4:
-                names.append(' '.join(parts[3:]))
-    return names
+            # 'Enabled    Connected    Dedicated    Wi-Fi 2' -> the name is everything after the 3rd column
+            parts = line.split(None, 3)
+            if len(parts) == 4 and parts[0].lower() not in _ADAPTER_TABLE_HEADERS:
+                names[parts[3].strip()] = None
+        _adapters_cache = (now, tuple(names))
+    return list(names)
 
 def suggest_adapters():
     return suggest_adapters_local()
 
-def set_java_priority(name='Normal'):
+def set_java_priority(name='Normal', procs=None):
     PRIORITY_CLASSES = {
         'Idle': getattr(psutil, 'IDLE_PRIORITY_CLASS', 64),
         'Below Normal': getattr(psutil, 'BELOW_NORMAL_PRIORITY_CLASS', 16384),
@@ -726,28 +816,39 @@ def set_java_priority(name='Normal'):
         'High': getattr(psutil, 'HIGH_PRIORITY_CLASS', 128),
         'Realtime': getattr(psutil, 'REALTIME_PRIORITY_CLASS', 256),
     }
+    if procs is None:
+        procs = scan_processes()
+    tgt = PRIORITY_CLASSES.get(name, PRIORITY_CLASSES['Normal'])
     changed = 0
-    for proc in psutil.process_iter(attrs=('name','pid')):
+    for pid in procs.get('java.exe', []) + procs.get('javaw.exe', []):
         try:
-            nm = (proc.info.get('name') or '').lower()
-            if nm in ('java.exe','javaw.exe'):
-                p = psutil.Process(proc.info['pid'])
-                p.nice(PRIORITY_CLASSES.get(name, PRIORITY_CLASSES['Normal']))
+            p = psutil.Process(pid)
+            # reading the class is cheap; skip SetPriorityClass when it's already there
+            if p.nice() != tgt:
+                p.nice(tgt)
                 changed += 1
         except Exception:
             continue
     return changed
 
-# monitors
-def update_monitors():
-    try:
-        cpu_var.set(f"{psutil.cpu_percent()}%")
-        ram_var.set(f"{psutil.virtual_memory().percent}%")
-    except Exception:
-        pass
-    app.after(800, update_monitors)
+# monitors: sample on a daemon thread so slow perf-counter queries never stall the UI,
+# and hand the values to Tk via after_idle
+def _push_monitors(cpu, ram):
+    cpu_var.set(f"{cpu}%")
+    ram_var.set(f"{ram}%")
 
-update_monitors()
+def _monitor_loop(interval=0.8):
+    psutil.cpu_percent(interval=None)  # prime: the first non-blocking call always returns 0.0
+    while True:
+        time.sleep(interval)
+        try:
+            cpu = psutil.cpu_percent(interval=None)
+            ram = psutil.virtual_memory().percent
+            app.after_idle(_push_monitors, cpu, ram)
+        except Exception:
+            pass
+
+threading.Thread(target=_monitor_loop, daemon=True).start()
 
 # Load config into UI
 _cfg = load_config()
@@ -807,17 +908,10 @@ set_active_tab_button(first)
 
 # bind resizing to adjust page sizes
 def on_resize(e):
-    # keep pages sized using relwidth/relheight so CTk doesn't require width/height in place()
-    for name, p in pages.items():
-        try:
-            info = p.place_info()
-            if info:
-                # ensure page stays full-size relative to the container
-                p.place_configure(relwidth=1, relheight=1)
-                # if the page was positioned with x offset, ensure that offset is within new width
-                # (no explicit width set — CTk frames will expand with relwidth)
-        except Exception:
-            pass
+    # pages are placed with relwidth/relheight=1 and follow the container on their own;
+    # only the cached width the slide animation needs is refreshed here
+    global _content_w
+    _content_w = e.width
 
 content_holder.bind("<Configure>", on_resize)
 
@@ -14,6 +14,7 @@ Notes:
 """
 
 import os
+import re
 import sys
 import time
 import json
@@ -182,6 +183,10 @@ def dns_flush():
     return run_cmd("ipconfig /flushdns", timeout=10)
 
 
+# "Minimum = 11ms, Maximum = 14ms, Average = 12ms" summary line of Windows ping
+_AVG_RE = re.compile(r"Average\s*=\s*(\d+)\s*ms")
+
+
 def dns_benchmark(servers, timeout=2, count=3):
     results = {}
     if not IS_WINDOWS:
@@ -191,15 +196,8 @@ def dns_benchmark(servers, timeout=2, count=3):
     for s in servers:
         try:
             code, out = run_cmd(f"ping -n {count} -w {int(timeout*1000)} {s}", timeout=10)
-            avg = None
-            for line in out.splitlines():
-                if "Average =" in line or "Average" in line:
-                    parts = line.replace(" ", "").split("=")
-                    try:
-                        avg = int(parts[-1].replace("ms", ""))
-                    except Exception:
-                        avg = None
-            results[s] = avg
+            m = _AVG_RE.search(out)
+            results[s] = int(m.group(1)) if m else None
         except Exception:
             results[s] = None
     return results